@@ -1,8 +1,13 @@
 import sys
 import pygame
-import heapq
+import numpy as np
 from collections import deque
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the pure-Python paths still work
+    njit = None
+
 # ---------------- PIPE DEFINITIONS ---------------- #
 PIPE_TYPES = {
     'l': [[1, 3], [0, 2]],  # straight line
@@ -16,6 +21,135 @@ PIPE_TYPES = {
 # directions: 0=up,1=right,2=down,3=left
 DIRS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
 
+# Tiles are stored structure-of-arrays style: a uint8 type id per cell plus a
+# uint8 rotation per cell.  CONN_MASK[type_id, rot] packs the open directions
+# of that (type, rotation) into one byte: bit 0=N, bit 1=E, bit 2=S, bit 3=W.
+TYPE_ID = {'l': 0, 'v': 1, 't': 2, 'c': 3, 'e': 4, 'n': 5}
+
+CONN_MASK = np.zeros((6, 4), dtype=np.uint8)
+NUM_ROTS = np.zeros(6, dtype=np.uint8)
+for _type, _variations in PIPE_TYPES.items():
+    _tid = TYPE_ID[_type]
+    NUM_ROTS[_tid] = len(_variations)
+    for _rot in range(4):
+        _mask = 0
+        for _d in _variations[_rot % len(_variations)]:
+            _mask |= 1 << _d
+        CONN_MASK[_tid, _rot] = _mask
+
+# Per-direction bit and opposite-direction tables, plus a per-(type, rotation)
+# tuple of (direction, opp_bit) for the open directions so hot loops iterate
+# one prebuilt tuple instead of rebuilding direction lists from PIPE_TYPES.
+DIR_BITS = (1, 2, 4, 8)
+OPP = (2, 3, 0, 1)
+OPEN_DIRS = tuple(
+    tuple(
+        tuple(
+            (_d, DIR_BITS[OPP[_d]])
+            for _d in range(4)
+            if (CONN_MASK[_tid, _rot] >> _d) & 1
+        )
+        for _rot in range(4)
+    )
+    for _tid in range(6)
+)
+
+# Flat neighbor-index tables, one per grid size: NEIGHBORS[i][d] is the flat
+# index of cell i's neighbor in direction d, or -1 off the grid.  The grid is
+# addressed as i = r*n + c throughout the hot loops, so every neighbor probe
+# is one tuple load plus a sign check instead of two bounds comparisons.
+_NEIGHBOR_TABLES = {}
+
+
+def neighbor_table(grid_size):
+    table = _NEIGHBOR_TABLES.get(grid_size)
+    if table is None:
+        n = grid_size
+        table = tuple(
+            tuple(
+                (r + dr) * n + (c + dc)
+                if 0 <= r + dr < n and 0 <= c + dc < n else -1
+                for dr, dc in DIRS
+            )
+            for r in range(n)
+            for c in range(n)
+        )
+        _NEIGHBOR_TABLES[grid_size] = table
+    return table
+
+# JIT-compiled kernels for the two full-grid scans (flood fill from the
+# source and the dangling-opening count).  They work on the raw uint8 arrays
+# with a preallocated stack, so a whole scan runs without touching the
+# Python interpreter.
+DR = np.array([-1, 0, 1, 0], dtype=np.int8)
+DC = np.array([0, 1, 0, -1], dtype=np.int8)
+
+if njit is not None:
+    @njit(cache=True)
+    def _flood_kernel(type_ids, rotations, conn_mask, sr, sc):
+        n = type_ids.shape[0]
+        visited = np.zeros((n, n), dtype=np.uint8)
+        stack = np.empty(n * n, dtype=np.int32)
+        top = 0
+        stack[top] = sr * n + sc
+        top += 1
+        visited[sr, sc] = 1
+        while top > 0:
+            top -= 1
+            idx = stack[top]
+            r = idx // n
+            c = idx % n
+            mask = conn_mask[type_ids[r, c], rotations[r, c]]
+            for d in range(4):
+                if not (mask >> d) & 1:
+                    continue
+                nr = r + DR[d]
+                nc = c + DC[d]
+                if nr < 0 or nr >= n or nc < 0 or nc >= n:
+                    continue
+                if visited[nr, nc]:
+                    continue
+                if (conn_mask[type_ids[nr, nc], rotations[nr, nc]] >> (d ^ 2)) & 1:
+                    visited[nr, nc] = 1
+                    stack[top] = nr * n + nc
+                    top += 1
+        return visited
+
+    @njit(cache=True)
+    def _dangling_kernel(type_ids, rotations, conn_mask):
+        n = type_ids.shape[0]
+        total = 0
+        for r in range(n):
+            for c in range(n):
+                mask = conn_mask[type_ids[r, c], rotations[r, c]]
+                for d in range(4):
+                    if not (mask >> d) & 1:
+                        continue
+                    nr = r + DR[d]
+                    nc = c + DC[d]
+                    if nr < 0 or nr >= n or nc < 0 or nc >= n:
+                        total += 1
+                    elif not (conn_mask[type_ids[nr, nc], rotations[nr, nc]] >> (d ^ 2)) & 1:
+                        total += 1
+        return total
+
+# Tile types never change during a search, so the rotations alone identify a
+# state.  They are packed 2 bits per cell into one Python int, which serves
+# both as the exact state hash and as the state identity in the solver's
+# dicts — no collisions, and apply_action updates it with two bit operations.
+def pack_rotations(rotations):
+    packed = 0
+    for i, rot in enumerate(rotations.flat):
+        packed |= int(rot) << (2 * i)
+    return packed
+
+
+def unpack_rotations(packed, grid_size):
+    rotations = np.empty(grid_size * grid_size, dtype=np.uint8)
+    for i in range(grid_size * grid_size):
+        rotations[i] = (packed >> (2 * i)) & 3
+    return rotations.reshape(grid_size, grid_size)
+
 
 # ---------------- BASIC CLASSES ---------------- #
 class Action:
@@ -27,150 +161,398 @@ class Action:
         return f"Rotate {self.pos} -> {self.rotation}"
 
 
-class Tile:
-    def __init__(self, type_char, rotation=0):
-        self.type = type_char
-        self.rotation = rotation
+# Actions are immutable and drawn from a tiny (cell, rotation) space, so the
+# action generator reuses one instance per combination instead of allocating
+# fresh objects every expansion.
+_ACTION_CACHE = {}
 
-    def rotate(self, rot):
-        return Tile(self.type, rot)
 
-    def get_connections(self):
-        if self.type not in PIPE_TYPES:
-            return []
-        variations = PIPE_TYPES[self.type]
-        rot = self.rotation % len(variations)
-        return [DIRS[d] for d in variations[rot]]
-
-    def __repr__(self):
-        return f"{self.type}{self.rotation}"
+def _get_action(r, c, rot):
+    key = (r, c, rot)
+    action = _ACTION_CACHE.get(key)
+    if action is None:
+        action = _ACTION_CACHE[key] = Action((r, c), rot)
+    return action
 
 
 class GameState:
-    def __init__(self, grid_size, tiles, source):
+    def __init__(self, grid_size, type_ids, rotations, source, packed=None):
         self.grid_size = grid_size
-        self.tiles = tiles  # {(r,c): Tile}
+        self.type_ids = type_ids  # uint8[H,W]
+        self.rotations = rotations  # uint8[H,W]
         self.source = source  # (r,c)
-
-    def hash(self):
-        return tuple((pos, t.type, t.rotation) for pos, t in sorted(self.tiles.items()))
-
-    def __eq__(self, other):
-        return self.hash() == other.hash()
+        # flat views of the grids for the i = r*n + c indexed hot loops
+        self.type_flat = type_ids.reshape(-1)
+        self.rot_flat = rotations.reshape(-1)
+        # rotations packed 2 bits per cell; exact state hash and identity
+        self.packed = pack_rotations(rotations) if packed is None else packed
+        # bitmap of tiles reachable from the source, bit r*n+c per cell
+        self._connected = None
+        self._dangling = None  # cached count of unmatched pipe openings
+        self._num_nonempty = None  # cells that hold an actual pipe
+        self._feasible = None  # per-cell tuple of rotations worth trying
+
+    def num_nonempty_tiles(self):
+        if self._num_nonempty is None:
+            self._num_nonempty = int(np.count_nonzero(self.type_ids != TYPE_ID['n']))
+        return self._num_nonempty
 
     def is_goal(self):
-        # BFS from source following connections
-        visited = set()
-        frontier = [self.source]
-        while frontier:
-            r, c = frontier.pop()
-            if (r, c) in visited:
-                continue
-            visited.add((r, c))
-            if (r, c) not in self.tiles:
-                continue
-            tile = self.tiles[(r, c)]
-            for dr, dc in tile.get_connections():
-                nr, nc = r + dr, c + dc
-                if (nr, nc) in self.tiles:
-                    neighbor = self.tiles[(nr, nc)]
-                    if (-dr, -dc) in [DIRS[d] for d in PIPE_TYPES[neighbor.type][neighbor.rotation % len(PIPE_TYPES[neighbor.type])]]:
-                        frontier.append((nr, nc))
-        return len(visited) == len(self.tiles)
-    
+        return self.connected_mask().bit_count() == self.num_nonempty_tiles()
+
+    def feasible_rots(self):
+        """Per-cell tuple of rotations that can appear in a solved grid.
+
+        Rotations that point an opening off the grid, or an end tile at
+        another end tile, can never be fully matched; they depend only on the
+        immutable tile types, so they are filtered out once per level.  Should
+        a cell end up with no feasible rotation (a malformed level), all its
+        rotations are kept rather than freezing the tile.
+        """
+        if self._feasible is None:
+            n = self.grid_size
+            end_id = TYPE_ID['e']
+            nbrs = neighbor_table(n)
+            tids = self.type_flat
+            feasible = []
+            for i in range(n * n):
+                tid = tids[i]
+                rots_ok = []
+                for rot in range(NUM_ROTS[tid]):
+                    ok = True
+                    for d, _ in OPEN_DIRS[tid][rot]:
+                        ni = nbrs[i][d]
+                        if ni < 0 or (tid == end_id and tids[ni] == end_id):
+                            ok = False
+                            break
+                    if ok:
+                        rots_ok.append(rot)
+                if not rots_ok:
+                    rots_ok = range(NUM_ROTS[tid])
+                feasible.append(tuple(rots_ok))
+            self._feasible = tuple(feasible)
+        return self._feasible
+
     def get_possible_actions(self):
         actions = []
-        for pos, tile in self.tiles.items():
-            variations = PIPE_TYPES[tile.type]
-            for rot in range(len(variations)):
-                if rot != tile.rotation:
-                    if tile.type == "e":
-                        # skip if would face another end or the edge
-                        valid = True
-                        for (dr, dc) in [DIRS[d] for d in PIPE_TYPES[tile.type][rot]]:
-                            nr, nc = pos[0] + dr, pos[1] + dc
-                            # Check if facing another end
-                            if (nr, nc) in self.tiles and self.tiles[(nr, nc)].type == "e":
-                                valid = False
-                                break
-                            # Check if facing the edge
-                            if nr < 0 or nr >= self.grid_size or nc < 0 or nc >= self.grid_size:
-                                valid = False
-                                break
-                        if valid:
-                            actions.append(Action(pos, rot))
-                    else:
-                        actions.append(Action(pos, rot))
+        n = self.grid_size
+        connected = self.connected_mask()
+        nbrs = neighbor_table(n)
+        tids = self.type_flat
+        rots = self.rot_flat
+        feasible = self.feasible_rots()
+        source_i = self.source[0] * n + self.source[1]
+        for i in range(n * n):
+            tid = tids[i]
+            cur_rot = rots[i]
+            cell_nbrs = nbrs[i]
+            for rot in feasible[i]:
+                if rot == cur_rot:
+                    continue
+                # Skip rotations that leave the tile detached from the
+                # current source component: any solution can be reordered
+                # so every rotated tile attaches to the component grown so
+                # far, so this prunes without losing reachable goals.
+                if i != source_i:
+                    attached = False
+                    for d, opp_bit in OPEN_DIRS[tid][rot]:
+                        ni = cell_nbrs[d]
+                        if ni < 0:
+                            continue
+                        if not (connected >> ni) & 1:
+                            continue
+                        if CONN_MASK[tids[ni], rots[ni]] & opp_bit:
+                            attached = True
+                            break
+                    if not attached:
+                        continue
+                actions.append(_get_action(i // n, i % n, rot))
         return actions
 
     def apply_action(self, action):
-        new_tiles = dict(self.tiles)
-        new_tiles[action.pos] = new_tiles[action.pos].rotate(action.rotation)
-        return GameState(self.grid_size, new_tiles, self.source)
-
-    def get_connected_tiles(self):
-        visited = set()
-        frontier = [self.source]
+        r, c = action.pos
+        new_rotations = self.rotations.copy()
+        new_rotations[r, c] = action.rotation
+        shift = 2 * (r * self.grid_size + c)
+        new_packed = (self.packed & ~(3 << shift)) | (action.rotation << shift)
+        new_state = GameState(self.grid_size, self.type_ids, new_rotations, self.source, new_packed)
+        new_state._connected, new_state._dangling = self.child_metrics(action)
+        new_state._num_nonempty = self._num_nonempty
+        new_state._feasible = self._feasible
+        return new_state
+
+    def with_rotations(self, packed):
+        """Materialize the state identified by a packed rotation bitfield."""
+        state = GameState(self.grid_size, self.type_ids,
+                          unpack_rotations(packed, self.grid_size),
+                          self.source, packed)
+        state._num_nonempty = self._num_nonempty
+        state._feasible = self._feasible
+        return state
+
+    def child_metrics(self, action):
+        """Connected bitmap and dangling count of the child produced by
+        action, computed against this state's arrays.
+
+        The new rotation is written into self.rotations for the duration of
+        the computation and restored afterwards, so scoring a child never
+        copies the grid.  Only the rotated tile and its four neighbors can
+        change connectivity, so the parent's cached counts are adjusted from
+        that region; a full reflood happens only when the rotated tile was
+        part of the source component and may have cut it.
+        """
+        r, c = action.pos
+        n = self.grid_size
+        i = r * n + c
+        # parent caches must be resolved before the rotation override below
+        conn = self.connected_mask()
+        parent_dangling = self.dangling_count()
+        nbrs = neighbor_table(n)
+        region = [i] + [ni for ni in nbrs[i] if ni >= 0]
+        region_bits = 0
+        for ri in region:
+            region_bits |= 1 << ri
+
+        old_region = sum(self._cell_dangling(ri) for ri in region)
+        old_rot = self.rot_flat[i]
+        self.rot_flat[i] = action.rotation
+        try:
+            dangling = (parent_dangling - old_region
+                        + sum(self._cell_dangling(ri) for ri in region))
+
+            if not conn & region_bits:
+                # Tile was detached from the source component and stays so:
+                # the component is unchanged.
+                connected = conn
+            elif not (conn >> i) & 1:
+                # Tile may newly attach to the component; the component can
+                # only grow, so flood just the new region.
+                attached = False
+                for d, opp_bit in OPEN_DIRS[self.type_flat[i]][action.rotation]:
+                    ni = nbrs[i][d]
+                    if ni < 0:
+                        continue
+                    if not (conn >> ni) & 1:
+                        continue
+                    if CONN_MASK[self.type_flat[ni], self.rot_flat[ni]] & opp_bit:
+                        attached = True
+                        break
+                connected = self._flood(i, conn) if attached else conn
+            else:
+                # The rotated tile was part of the component, which may have
+                # been cut anywhere downstream of it; reflood from scratch.
+                if njit is not None:
+                    flags = _flood_kernel(self.type_ids, self.rotations, CONN_MASK,
+                                          self.source[0], self.source[1])
+                    connected = int.from_bytes(
+                        np.packbits(flags.ravel(), bitorder='little').tobytes(), 'little')
+                else:
+                    source_i = self.source[0] * n + self.source[1]
+                    connected = self._flood(source_i, 0)
+        finally:
+            self.rot_flat[i] = old_rot
+        return connected, dangling
+
+    def connected_mask(self):
+        if self._connected is None:
+            if njit is not None:
+                flags = _flood_kernel(self.type_ids, self.rotations, CONN_MASK,
+                                      self.source[0], self.source[1])
+                self._connected = int.from_bytes(
+                    np.packbits(flags.ravel(), bitorder='little').tobytes(), 'little')
+            else:
+                source_i = self.source[0] * self.grid_size + self.source[1]
+                self._connected = self._flood(source_i, 0)
+        return self._connected
+
+    def _flood(self, start_i, visited):
+        # visited is an int bitmap, one bit per cell at r*n+c; marking happens
+        # before the push so no cell is ever stacked twice
+        nbrs = neighbor_table(self.grid_size)
+        tids = self.type_flat
+        rots = self.rot_flat
+        start_bit = 1 << start_i
+        if visited & start_bit:
+            return visited
+        visited |= start_bit
+        frontier = [start_i]
         while frontier:
-            r, c = frontier.pop()
-            if (r, c) in visited or (r, c) not in self.tiles:
-                continue
-            visited.add((r, c))
-            tile = self.tiles[(r, c)]
-            for dr, dc in tile.get_connections():
-                nr, nc = r + dr, c + dc
-                if (nr, nc) in self.tiles:
-                    neighbor = self.tiles[(nr, nc)]
-                    if (-dr, -dc) in [DIRS[d] for d in PIPE_TYPES[neighbor.type][neighbor.rotation % len(PIPE_TYPES[neighbor.type])]]:
-                        frontier.append((nr, nc))
+            i = frontier.pop()
+            cell_nbrs = nbrs[i]
+            for d, opp_bit in OPEN_DIRS[tids[i]][rots[i]]:
+                ni = cell_nbrs[d]
+                if ni < 0:
+                    continue
+                bit = 1 << ni
+                if visited & bit:
+                    continue
+                # the neighbor connects back iff its opposite direction bit is set
+                if CONN_MASK[tids[ni], rots[ni]] & opp_bit:
+                    visited |= bit
+                    frontier.append(ni)
         return visited
 
+    def _cell_dangling(self, i):
+        nbrs = neighbor_table(self.grid_size)[i]
+        tids = self.type_flat
+        rots = self.rot_flat
+        count = 0
+        for d, opp_bit in OPEN_DIRS[tids[i]][rots[i]]:
+            ni = nbrs[d]
+            if ni < 0:
+                count += 1
+            elif not CONN_MASK[tids[ni], rots[ni]] & opp_bit:
+                count += 1
+        return count
+
+    def dangling_count(self):
+        if self._dangling is None:
+            if njit is not None:
+                self._dangling = int(_dangling_kernel(self.type_ids, self.rotations, CONN_MASK))
+            else:
+                self._dangling = sum(
+                    self._cell_dangling(i)
+                    for i in range(self.grid_size * self.grid_size)
+                )
+        return self._dangling
+
 
 # ---------------- A* SOLVER ---------------- #
+# ida_star: goal sentinel (f values are ints, so any non-int works) and a cap
+# on the per-pass transposition table so solver memory stays bounded.
+_FOUND = object()
+_TRANSPOSITION_CAP = 1 << 20
+
+
 class AISolver:
     def __init__(self, initial_state):
         self.initial_state = initial_state
 
     def heuristic(self, state: GameState) -> int:
-        connected = len(state.get_connected_tiles())
-        dangling = 0
-        for (r, c), tile in state.tiles.items():
-            for (dr, dc) in tile.get_connections():
-                nr, nc = r + dr, c + dc
-                if (nr, nc) not in state.tiles:
-                    dangling += 1
-                else:
-                    neighbor = state.tiles[(nr, nc)]
-                    if (-dr, -dc) not in neighbor.get_connections():
-                        dangling += 1
-        return -(connected * 10) + dangling
+        return -(state.connected_mask().bit_count() * 10) + state.dangling_count()
 
     def solve(self):
-        frontier = []
-        heapq.heappush(frontier, (0, 0, self.initial_state, []))
-        explored = {}
+        # f is a small bounded integer (path length plus the integer
+        # heuristic), so a bucket per f value replaces the binary heap:
+        # push/pop are O(1) appends and pops, LIFO within a bucket
+        initial = self.initial_state
+        # entries are (g, packed, connected bitmap, dangling count): children
+        # exist only as their packed key plus cached metrics until they are
+        # popped, so generating a child never copies the grid
+        buckets = {0: [(0, initial.packed, None, None)]}
+        min_f = 0
+        # best f seen per state hash; children are only pushed when they
+        # strictly improve on it, and stale entries are dropped on pop
+        best_f = {initial.packed: 0}
+        # parent pointers per state hash, used to rebuild the action list at
+        # the goal instead of copying a growing path into every entry
+        parents = {}
         counter = 0
-
-        while frontier:
-            f, _, state, path = heapq.heappop(frontier)
+        grid_size = initial.grid_size
+
+        while buckets:
+            while min_f not in buckets:
+                min_f += 1
+            bucket = buckets[min_f]
+            g, packed, connected, dangling = bucket.pop()
+            if not bucket:
+                del buckets[min_f]
+            if min_f > best_f.get(packed, min_f):
+                continue  # a better entry for this state was pushed later
+            state = initial if packed == initial.packed else initial.with_rotations(packed)
+            state._connected = connected if connected is not None else state._connected
+            state._dangling = dangling if dangling is not None else state._dangling
             if state.is_goal():
                 print("iterations: ", counter)
-                return path
-            if state.hash() in explored and explored[state.hash()] <= f:
-                continue
-            explored[state.hash()] = f
+                return self._reconstruct_path(parents, packed)
 
-            g = len(path)
             for action in state.get_possible_actions():
-                new_state = state.apply_action(action)
-                h = self.heuristic(new_state)
-                new_f = g + 1 + h
+                r, c = action.pos
+                shift = 2 * (r * grid_size + c)
+                new_packed = (packed & ~(3 << shift)) | (action.rotation << shift)
+                new_connected, new_dangling = state.child_metrics(action)
+                new_f = g + 1 - new_connected.bit_count() * 10 + new_dangling
+                if new_f >= best_f.get(new_packed, sys.maxsize):
+                    continue
+                best_f[new_packed] = new_f
+                parents[new_packed] = (packed, action)
                 counter += 1
-                heapq.heappush(frontier, (new_f, counter, new_state, path + [action]))
-        
-        
+                buckets.setdefault(new_f, []).append((g + 1, new_packed, new_connected, new_dangling))
+                if new_f < min_f:
+                    min_f = new_f
+
         return None
 
+    def ida_star(self):
+        """Iterative-deepening A*: repeated depth-first passes with a growing
+        f bound.  Memory stays O(depth) plus a capped transposition table,
+        instead of holding every generated state like solve() does, at the
+        cost of re-expanding shallow states on each deepening pass."""
+        initial = self.initial_state
+        # dives can run hundreds of moves deep on larger grids
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * initial.grid_size ** 4))
+        bound = self.heuristic(initial)
+        self._counter = 0
+        path = []
+        while True:
+            self._transposition = {initial.packed: 0}
+            t = self._ida_dfs(initial, 0, bound, path)
+            if t is _FOUND:
+                print("iterations: ", self._counter)
+                return path
+            if t == sys.maxsize:
+                return None
+            bound = t
+
+    def _ida_dfs(self, state, g, bound, path):
+        if state.is_goal():
+            return _FOUND
+        minimum = sys.maxsize
+        grid_size = state.grid_size
+        children = []
+        for action in state.get_possible_actions():
+            r, c = action.pos
+            shift = 2 * (r * grid_size + c)
+            new_packed = (state.packed & ~(3 << shift)) | (action.rotation << shift)
+            if self._transposition.get(new_packed, sys.maxsize) <= g + 1:
+                continue  # already reached at least as shallow this pass
+            connected, dangling = state.child_metrics(action)
+            f = g + 1 - connected.bit_count() * 10 + dangling
+            if f > bound:
+                if f < minimum:
+                    minimum = f
+                continue
+            children.append((f, action, new_packed, connected, dangling))
+        # best child first keeps the dive pointed at the goal instead of
+        # exhausting a bad subtree to full depth
+        children.sort(key=lambda child: child[0])
+        for f, action, new_packed, connected, dangling in children:
+            if self._transposition.get(new_packed, sys.maxsize) <= g + 1:
+                continue  # reached meanwhile through a sibling subtree
+            if len(self._transposition) < _TRANSPOSITION_CAP:
+                self._transposition[new_packed] = g + 1
+            self._counter += 1
+            child = state.with_rotations(new_packed)
+            child._connected = connected
+            child._dangling = dangling
+            path.append(action)
+            t = self._ida_dfs(child, g + 1, bound, path)
+            if t is _FOUND:
+                return t
+            if t < minimum:
+                minimum = t
+            path.pop()
+        return minimum
+
+    def _reconstruct_path(self, parents, goal_packed):
+        path = []
+        packed = goal_packed
+        while packed != self.initial_state.packed:
+            packed, action = parents[packed]
+            path.append(action)
+        path.reverse()
+        return path
+
 
 # ---------------- PARSER ---------------- #
 def parse_level(path):
@@ -179,15 +561,14 @@ def parse_level(path):
 
     grid_size = 0
     cell_size = 100
-    tiles = {}
+    rows = []
     source = (0, 0)
 
     mode = None
-    row = 0
     for line in lines:
         if line.startswith("["):
             if line == "[GRID]": mode = "grid"
-            elif line == "[TILES]": mode = "tiles"; row = 0
+            elif line == "[TILES]": mode = "tiles"
             elif line == "[SOURCE]": mode = "source"
             continue
 
@@ -197,16 +578,20 @@ def parse_level(path):
             elif line.startswith("cell_size="):
                 cell_size = int(line.split("=")[1])
         elif mode == "tiles":
-            parts = line.split()
-            for col, token in enumerate(parts):
-                t, rot = token[0], int(token[1])
-                tiles[(row, col)] = Tile(t, rot)
-            row += 1
+            rows.append(line.split())
         elif mode == "source":
             r, c = map(int, line.split())
             source = (r, c)
 
-    return grid_size, cell_size, tiles, source
+    type_ids = np.zeros((grid_size, grid_size), dtype=np.uint8)
+    rotations = np.zeros((grid_size, grid_size), dtype=np.uint8)
+    for r, row in enumerate(rows):
+        for c, token in enumerate(row):
+            tid = TYPE_ID[token[0]]
+            type_ids[r, c] = tid
+            rotations[r, c] = int(token[1]) % NUM_ROTS[tid]
+
+    return grid_size, cell_size, type_ids, rotations, source
 
 def draw(screen, state, grid_size, cell_size):
     # Colors
@@ -227,42 +612,41 @@ def draw(screen, state, grid_size, cell_size):
         pygame.draw.line(screen, GRID_COLOR, (i * cell_size, 0), (i * cell_size, grid_size * cell_size), 2)
 
     # Get connected tiles for coloring
-    connected = state.get_connected_tiles()
+    connected = state.connected_mask()
 
     # Draw tiles
-    for (r, c), tile in state.tiles.items():
-        center_x = c * cell_size + cell_size // 2
-        center_y = r * cell_size + cell_size // 2
-        half = cell_size // 2
-
-        # Color logic
-        color = CONNECTED_COLOR if (r, c) == state.source or (r, c) in connected else UNCONNECTED_COLOR
-
-        # Directions: 0-N, 1-E, 2-S, 3-W
-        dirs = {
-            0: (center_x, center_y - half),
-            1: (center_x + half, center_y),
-            2: (center_x, center_y + half),
-            3: (center_x - half, center_y)
-        }
-
-        # Draw pipe segments
-        for d in PIPE_TYPES[tile.type][tile.rotation % len(PIPE_TYPES[tile.type])]:
-            end_pos = dirs[d]
-            pygame.draw.line(screen, color, (center_x, center_y), end_pos, PIPE_THICKNESS)
-
-        # Draw center circle for 'e' (end) tiles
-        if tile.type == 'e':
-            pygame.draw.circle(screen, color, (center_x, center_y), CENTER_CIRCLE_RADIUS)
-
-        # Draw red circle for source
-        if (r, c) == state.source:
-            pygame.draw.circle(screen, SOURCE_COLOR, (center_x, center_y), CENTER_CIRCLE_RADIUS)
-
-        # Draw tile type+rotation text
-        # font = pygame.font.SysFont(None, 24)
-        # text = font.render(str(tile), True, (220, 220, 220))
-        # screen.blit(text, (c * cell_size + 10, r * cell_size + 10))
+    for r in range(grid_size):
+        for c in range(grid_size):
+            center_x = c * cell_size + cell_size // 2
+            center_y = r * cell_size + cell_size // 2
+            half = cell_size // 2
+
+            # Color logic
+            is_connected = (connected >> (r * grid_size + c)) & 1
+            color = CONNECTED_COLOR if (r, c) == state.source or is_connected else UNCONNECTED_COLOR
+
+            # Directions: 0-N, 1-E, 2-S, 3-W
+            dirs = {
+                0: (center_x, center_y - half),
+                1: (center_x + half, center_y),
+                2: (center_x, center_y + half),
+                3: (center_x - half, center_y)
+            }
+
+            # Draw pipe segments
+            mask = CONN_MASK[state.type_ids[r, c], state.rotations[r, c]]
+            for d in range(4):
+                if (mask >> d) & 1:
+                    end_pos = dirs[d]
+                    pygame.draw.line(screen, color, (center_x, center_y), end_pos, PIPE_THICKNESS)
+
+            # Draw center circle for 'e' (end) tiles
+            if state.type_ids[r, c] == TYPE_ID['e']:
+                pygame.draw.circle(screen, color, (center_x, center_y), CENTER_CIRCLE_RADIUS)
+
+            # Draw red circle for source
+            if (r, c) == state.source:
+                pygame.draw.circle(screen, SOURCE_COLOR, (center_x, center_y), CENTER_CIRCLE_RADIUS)
 
 # ---------------- PYGAME VIEWER ---------------- #
 def run_viewer(state, solution, cell_size):
@@ -283,19 +667,6 @@ def run_viewer(state, solution, cell_size):
 
         draw(screen, state, state.grid_size, cell_size)
 
-        # pygame.display.flip()
-        # clock.tick(30)
-    # pygame.quit()
-
-
-        # screen.fill((30, 30, 30))
-        # for (r, c), tile in state.tiles.items():
-        #     rect = pygame.Rect(c * cell_size, r * cell_size, cell_size, cell_size)
-        #     pygame.draw.rect(screen, (80, 80, 80), rect, 1)
-        #     # draw tile type+rotation text
-        #     font = pygame.font.SysFont(None, 24)
-        #     text = font.render(str(tile), True, (200, 200, 200))
-        #     screen.blit(text, (c * cell_size + 10, r * cell_size + 10))
         pygame.display.flip()
         clock.tick(30)
     pygame.quit()
@@ -307,12 +678,12 @@ if __name__ == "__main__":
         print("Usage: python blind_search.py level.txt")
         sys.exit(1)
 
-    grid_size, cell_size, tiles, source = parse_level(sys.argv[1])
-    state = GameState(grid_size, tiles, source)
+    grid_size, cell_size, type_ids, rotations, source = parse_level(sys.argv[1])
+    state = GameState(grid_size, type_ids, rotations, source)
 
-    print("Solving with A*...")
+    print("Solving with IDA*...")
     solver = AISolver(state)
-    solution = solver.solve()
+    solution = solver.ida_star()
     if solution:
         print(f"Solution found in {len(solution)} steps")
     else:
@@ -1,7 +1,6 @@
 import pygame
 import random
 import sys
-from typing import List, Tuple
 
 # Constants
 BACKGROUND_COLOR = (0, 0, 0)
@@ -24,27 +23,33 @@ PIPE_TYPES = {
     'n': [[]] #none
 }
 
-class Tile:
-    def __init__(self, type_name: str, rotation: int = 0):
-        self.type_name = type_name
-        self.variations = PIPE_TYPES[type_name]
-        self.rotation = rotation % len(self.variations)
-        self.connections = self.variations[self.rotation]
-        self.locked = False
-
-    def rotate(self, clockwise: bool = True):
-        if self.locked:
-            return
-        num_vars = len(self.variations)
-        self.rotation = (self.rotation + (1 if clockwise else -1)) % num_vars
-        self.connections = self.variations[self.rotation]
-
-    def get_connections(self) -> List[int]:
-        return self.connections
+# Neighbor deltas (dr, dc, my_dir, their_dir) for N, E, S, W; hoisted to
+# module scope so get_neighbors does not rebuild the list on every call
+_DELTAS = ((-1, 0, 0, 2), (0, 1, 1, 3), (1, 0, 2, 0), (0, -1, 3, 1))
+
+# The grid is stored structure-of-arrays style in bytearrays (one type id,
+# rotation and locked flag per cell) instead of per-cell Tile objects.
+# CONN_MASK[type_id][rot] packs the open directions of a (type, rotation)
+# into one byte (bit per direction); CONN_DIRS lists them for drawing.
+TYPE_ID = {'l': 0, 'v': 1, 't': 2, 'c': 3, 'e': 4, 'n': 5}
+
+NUM_ROTS = [0] * 6
+CONN_MASK = [[0] * 4 for _ in range(6)]
+CONN_DIRS = [[()] * 4 for _ in range(6)]
+for _type, _variations in PIPE_TYPES.items():
+    _tid = TYPE_ID[_type]
+    NUM_ROTS[_tid] = len(_variations)
+    for _rot in range(4):
+        _dirs = _variations[_rot % len(_variations)]
+        CONN_DIRS[_tid][_rot] = tuple(_dirs)
+        for _d in _dirs:
+            CONN_MASK[_tid][_rot] |= 1 << _d
 
 class PipesGame:
     def __init__(self, level_file: str = "level0.txt"):
-        self.grid = []
+        self.type_ids = bytearray()
+        self.rotations = bytearray()
+        self.locked = bytearray()
         self.water_source = (0, 0)
         self.level_file = level_file
         self.grid_size = 4
@@ -57,7 +62,12 @@ class PipesGame:
         pygame.display.set_caption("Pipes Puzzle")
         self.clock = pygame.time.Clock()
         self.running = True
+        # pre-rendered tile surfaces keyed by (type, rotation, color); only a
+        # few dozen combinations exist, so the cache fills up within a frame
+        self._sprite_cache = {}
         self.connected_tiles = set()
+        self.connected_edges = 0
+        self.num_nonempty = sum(1 for tid in self.type_ids if tid != TYPE_ID['n'])
         self.update_connected_tiles()
 
     def load_level(self):
@@ -117,14 +127,15 @@ v2 l1 l0 v1
                 tiles = line.split()
                 if len(tiles) != self.grid_size:
                     raise ValueError(f"Row {row} in [TILES] has {len(tiles)} tiles, expected {self.grid_size}")
-                grid_row = []
                 for tile_str in tiles:
                     type_name = tile_str[0] if tile_str != 'n' else 'n'
                     rotation = int(tile_str[1]) if tile_str != 'n' else 0
                     if type_name not in PIPE_TYPES:
                         raise ValueError(f"Invalid tile type: {type_name}")
-                    grid_row.append(Tile(type_name, rotation))
-                self.grid.append(grid_row)
+                    tid = TYPE_ID[type_name]
+                    self.type_ids.append(tid)
+                    self.rotations.append(rotation % NUM_ROTS[tid])
+                    self.locked.append(0)
 
             # Parse [SOURCE] section
             source_section = sections[2].split('\n')
@@ -148,51 +159,63 @@ v2 l1 l0 v1
                 col = x // self.cell_size
                 row = y // self.cell_size
                 if 0 <= row < self.grid_size and 0 <= col < self.grid_size:
-                    tile = self.grid[row][col]
+                    i = row * self.grid_size + col
                     if event.button == 1:  # Left click
                         mods = pygame.key.get_mods()
                         clockwise = not (mods & pygame.KMOD_CTRL)
-                        tile.rotate(clockwise)
+                        self.rotate_tile(i, clockwise)
                     elif event.button == 3:  # Right click
-                        tile.locked = not tile.locked
+                        self.locked[i] ^= 1
                 self.update_connected_tiles()
                 self.check_win()
 
+    def rotate_tile(self, i: int, clockwise: bool = True):
+        if self.locked[i]:
+            return
+        num_vars = NUM_ROTS[self.type_ids[i]]
+        self.rotations[i] = (self.rotations[i] + (1 if clockwise else -1)) % num_vars
+
     def draw_grid(self):
         self.screen.fill(BACKGROUND_COLOR)
         for i in range(self.grid_size + 1):
             pygame.draw.line(self.screen, GRID_COLOR, (0, i * self.cell_size), (self.screen_size, i * self.cell_size), 2)
             pygame.draw.line(self.screen, GRID_COLOR, (i * self.cell_size, 0), (i * self.cell_size, self.screen_size), 2)
 
+    def _tile_sprite(self, tid: int, rot: int, color) -> pygame.Surface:
+        key = (tid, rot, color)
+        sprite = self._sprite_cache.get(key)
+        if sprite is None:
+            size = self.cell_size
+            half = size // 2
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            dirs = {
+                0: (half, 0),     # North
+                1: (size, half),  # East
+                2: (half, size),  # South
+                3: (0, half)      # West
+            }
+            for d in CONN_DIRS[tid][rot]:
+                pygame.draw.line(sprite, color, (half, half), dirs[d], PIPE_THICKNESS)
+            if tid == TYPE_ID['e']:
+                pygame.draw.circle(sprite, color, (half, half), CENTER_CIRCLE_RADIUS)
+            self._sprite_cache[key] = sprite
+        return sprite
+
     def draw_tile(self, row: int, col: int):
-        tile = self.grid[row][col]
-        center_x = col * self.cell_size + self.cell_size // 2
-        center_y = row * self.cell_size + self.cell_size // 2
-        half = self.cell_size // 2
+        i = row * self.grid_size + col
         # Color logic: water source is always blue, connected tiles blue, others gray
-        color = LOCKED_COLOR if tile.locked else (
+        color = LOCKED_COLOR if self.locked[i] else (
             CONNECTED_COLOR if (row, col) == self.water_source or (row, col) in self.connected_tiles
             else UNCONNECTED_COLOR
         )
 
-        dirs = {
-            0: (center_x, center_y - half),  # North
-            1: (center_x + half, center_y),  # East
-            2: (center_x, center_y + half),  # South
-            3: (center_x - half, center_y)   # West
-        }
-
-        # Draw pipe segments
-        for d in tile.get_connections():
-            end_pos = dirs[d]
-            pygame.draw.line(self.screen, color, (center_x, center_y), end_pos, PIPE_THICKNESS)
-
-        if tile.type_name == 'e':
-            pygame.draw.circle(self.screen, color, (center_x, center_y), CENTER_CIRCLE_RADIUS)
+        sprite = self._tile_sprite(self.type_ids[i], self.rotations[i], color)
+        self.screen.blit(sprite, (col * self.cell_size, row * self.cell_size))
 
         # Draw red circle for water source
         if (row, col) == self.water_source:
-            pygame.draw.circle(self.screen, SOURCE_CIRCLE_COLOR, (center_x, center_y), CENTER_CIRCLE_RADIUS)
+            center = (col * self.cell_size + self.cell_size // 2, row * self.cell_size + self.cell_size // 2)
+            pygame.draw.circle(self.screen, SOURCE_CIRCLE_COLOR, center, CENTER_CIRCLE_RADIUS)
 
     def draw(self):
         self.draw_grid()
@@ -201,19 +224,24 @@ v2 l1 l0 v1
                 self.draw_tile(row, col)
         pygame.display.flip()
 
-    def get_neighbors(self, row: int, col: int) -> List[Tuple[int, int, int, int]]:
+    def get_neighbors(self, row: int, col: int):
         neighbors = []
-        deltas = [(-1, 0, 0, 2), (0, 1, 1, 3), (1, 0, 2, 0), (0, -1, 3, 1)]  # N, E, S, W
-        for dr, dc, my_dir, their_dir in deltas:
+        n = self.grid_size
+        my_mask = CONN_MASK[self.type_ids[row * n + col]][self.rotations[row * n + col]]
+        for dr, dc, my_dir, their_dir in _DELTAS:
             nr, nc = row + dr, col + dc
-            if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size:
-                if my_dir in self.grid[row][col].get_connections() and their_dir in self.grid[nr][nc].get_connections():
-                    neighbors.append((nr, nc, my_dir, their_dir))
+            if 0 <= nr < n and 0 <= nc < n:
+                if (my_mask >> my_dir) & 1:
+                    ni = nr * n + nc
+                    if (CONN_MASK[self.type_ids[ni]][self.rotations[ni]] >> their_dir) & 1:
+                        neighbors.append((nr, nc, my_dir, their_dir))
         return neighbors
 
     def update_connected_tiles(self):
-        # Flood-fill from water source to find connected tiles
+        # Flood-fill from water source to find connected tiles; counts the
+        # component's edges along the way for the acyclicity check
         self.connected_tiles = set()
+        self.connected_edges = 0
         from collections import deque
         stack = deque([self.water_source])
         visited = set()
@@ -223,59 +251,24 @@ v2 l1 l0 v1
             if (r, c) in visited:
                 continue
             visited.add((r, c))
-            if self.grid[r][c].get_connections():  # Skip empty tiles
+            i = r * self.grid_size + c
+            if CONN_MASK[self.type_ids[i]][self.rotations[i]]:  # Skip empty tiles
                 self.connected_tiles.add((r, c))
             for nr, nc, _, _ in self.get_neighbors(r, c):
+                if (r, c) < (nr, nc):  # Only count each edge once
+                    self.connected_edges += 1
                 if (nr, nc) not in visited:
                     stack.append((nr, nc))
 
     def check_connected_and_acyclic(self) -> bool:
-        parent = {}
-        rank = {}
-        edges = 0
-
-        def find(x):
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
-
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px == py:
-                return False  # Cycle
-            if rank[px] > rank[py]:
-                parent[py] = px
-            elif rank[px] < rank[py]:
-                parent[px] = py
-            else:
-                parent[py] = px
-                rank[px] += 1
+        # Reuses the counts from the last update_connected_tiles pass: if the
+        # flood fill did not reach every pipe tile it cannot be a win, and a
+        # connected component is acyclic iff it has exactly V-1 edges.
+        if self.num_nonempty == 0:
             return True
-
-        num_tiles = 0
-        for r in range(self.grid_size):
-            for c in range(self.grid_size):
-                if self.grid[r][c].get_connections():
-                    key = (r, c)
-                    parent[key] = key
-                    rank[key] = 0
-                    num_tiles += 1
-
-        if num_tiles == 0:
-            return True
-        for r in range(self.grid_size):
-            for c in range(self.grid_size):
-                if (r, c) in parent:
-                    for nr, nc, _, _ in self.get_neighbors(r, c):
-                        if (nr, nc) in parent:
-                            if (r, c) < (nr, nc):  # Only count each edge once
-                                edges += 1
-                            if not union((r, c), (nr, nc)):
-                                return False
-
-        root = find(self.water_source)
-        connected = all(find(k) == root for k in parent)
-        return connected
+        if len(self.connected_tiles) < self.num_nonempty:
+            return False
+        return self.connected_edges == len(self.connected_tiles) - 1
 
     def check_win(self):
         if self.check_connected_and_acyclic():